@@ -1,55 +1,174 @@
 import pandas as pd
 from pathlib import Path
-from data_loading import load_data
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional; fall back to plain pandas
+    pa = None
+    pc = None
+    pacsv = None
+from data_loading import load_data, DATE_FORMAT
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 PROCESSED_DIR = BASE_DIR / "data" / "processed"
 
+# Columns with a larger share of missing values are dropped
+MAX_MISSING_RATIO = 0.60
+
+# Arrow-backed strings when pyarrow is available
+TEXT_DTYPE = "string[pyarrow]" if pa is not None else "string"
 
-def basic_clean(df: pd.DataFrame) -> pd.DataFrame:
+
+def basic_clean(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
     """
     - Parse Date to datetime
-    - Standardize categorical text
+    - Standardize categorical text (stored as category: few distinct values)
     - Drop extremely missing columns (optional but recommended)
     - Keep NaNs (no aggressive imputation yet)
-    """
-    df = df.copy()
 
-    # 1) Parse Date
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-
-    # 2) Basic text cleanup
-    df["City"] = df["City"].astype(str).str.strip()
-    df["AQI_Bucket"] = df["AQI_Bucket"].astype(str).str.strip()
+    Returns the cleaned frame and its per-column NaN counts (one isna scan).
+    """
+    # 1) Parse Date + 2) Basic text cleanup
+    #    assign() returns a new frame with only these columns rebuilt,
+    #    so there is no need for a full df.copy() up front.
+    df = df.assign(
+        Date=pd.to_datetime(df["Date"], format=DATE_FORMAT, errors="coerce", cache=True),
+        City=df["City"].astype(TEXT_DTYPE).str.strip().astype("category"),
+        AQI_Bucket=df["AQI_Bucket"].astype(TEXT_DTYPE).str.strip().astype("category"),
+    )
 
     # 3) Drop columns with too many missing values (threshold = 60%)
     #    This keeps the dataset usable for EDA without throwing away rows.
-    missing_ratio = df.isna().mean()
-    cols_to_drop = missing_ratio[missing_ratio > 0.60].index.tolist()
+    na_counts = df.isna().sum()
+    missing_ratio = na_counts / len(df)
+    cols_to_drop = missing_ratio[missing_ratio > MAX_MISSING_RATIO].index.tolist()
 
     # Keep the list explicit in logs
     if cols_to_drop:
         print(f"Dropping columns (>60% missing): {cols_to_drop}")
         df = df.drop(columns=cols_to_drop)
+        na_counts = na_counts.drop(index=cols_to_drop)
+
+    return df, na_counts
 
-    return df
+
+def fast_strftime(s: pd.Series, fmt: str = DATE_FORMAT) -> pd.Series:
+    """
+    Format a datetime Series as text with Arrow's strftime kernel
+    (one vectorized call instead of a Python call per row). NaT stays missing.
+    Without pyarrow, uses pandas' Series.dt.strftime.
+    """
+    if pa is None:
+        return s.dt.strftime(fmt)
+    out = pc.strftime(pa.array(s), format=fmt)
+    return pd.Series(out, index=s.index, name=s.name, dtype=pd.ArrowDtype(pa.string()))
 
 
 def save_clean_base(df: pd.DataFrame, filename: str = "air_quality_clean_base.csv") -> Path:
     PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
     out_path = PROCESSED_DIR / filename
-    df.to_csv(out_path, index=False)
+    write_csv_arrow(df, out_path)
     return out_path
 
 
+# Characters that force a CSV field (or header name) to be quoted
+_CSV_SPECIAL = (",", '"', "\n", "\r")
+
+
+def _float_as_text(arr):
+    """
+    Arrow renders integral doubles as "184"; pandas/Python write "184.0".
+    Cast to text and add the ".0" back.
+    """
+    text = pc.cast(arr, pa.string())
+    integral = pc.match_substring_regex(text, r"^-?[0-9]+$")
+    return pc.if_else(integral, pc.binary_join_element_wise(text, ".0", ""), text)
+
+
+def _is_date_only(s: pd.Series) -> bool:
+    """
+    True if s is a tz-naive datetime column with every value at midnight
+    (NaT ignored), so DATE_FORMAT loses nothing.
+    """
+    if not pd.api.types.is_datetime64_dtype(s):
+        return False
+    s = s.dropna()
+    return bool((s.dt.normalize() == s).all())
+
+
+def _text_differs_from_pandas(t) -> bool:
+    """
+    Types Arrow's CSV writer renders differently from to_csv
+    (true/false for bools, extra fractional seconds on timestamps and times).
+    """
+    return (
+        pa.types.is_boolean(t)
+        or pa.types.is_timestamp(t)
+        or pa.types.is_time(t)
+        or pa.types.is_duration(t)
+    )
+
+
+def write_csv_arrow(df: pd.DataFrame, out_path: Path) -> None:
+    """
+    Write df as CSV with pyarrow's multithreaded writer. For the cleaned
+    dataset (Date, numeric and text columns) the layout matches
+    DataFrame.to_csv(index=False).
+    - Date is written as a plain ISO date (2015-01-01), like pandas does. If
+      some Date has a time of day (or Date is not a naive datetime column),
+      DataFrame.to_csv is used so the time is not dropped
+    - Float columns keep the trailing ".0" on integral values, so they read
+      back as float. Very small floats can be spelled differently from pandas
+      (0.000015 or 1e-7 instead of 1.5e-05 or 1e-07); the values are the same
+    - Frames with bool, time or duration columns, or datetimes other than Date,
+      are written with DataFrame.to_csv
+    - Nothing is quoted; if a value or column name needs quoting, a column
+      cannot be converted to Arrow, or pyarrow is missing, DataFrame.to_csv is
+      used instead
+    """
+    names = [str(c) for c in df.columns]
+    if (
+        pa is None
+        or any(ch in name for name in names for ch in _CSV_SPECIAL)
+        or ("Date" in df.columns and not _is_date_only(df["Date"]))
+    ):
+        df.to_csv(out_path, index=False)
+        return
+
+    try:
+        out = df.assign(Date=fast_strftime(df["Date"])) if "Date" in df.columns else df
+        table = pa.Table.from_pandas(out, preserve_index=False)
+        if any(_text_differs_from_pandas(field.type) for field in table.schema):
+            df.to_csv(out_path, index=False)
+            return
+        for i, field in enumerate(table.schema):
+            if pa.types.is_floating(field.type):
+                table = table.set_column(i, field.name, _float_as_text(table.column(i)))
+
+        with open(out_path, "wb") as fh:
+            fh.write((",".join(names) + "\n").encode("utf-8"))
+            pacsv.write_csv(
+                table,
+                fh,
+                write_options=pacsv.WriteOptions(include_header=False, quoting_style="none"),
+            )
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type object column, or a value that would need quoting
+        df.to_csv(out_path, index=False)
+
+
 def main():
-    df_raw = load_data()
-    df_clean = basic_clean(df_raw)
+    # Sparse columns are skipped at load time when the Parquet cache exists;
+    # basic_clean still drops them on the first (CSV) load.
+    df_raw = load_data(max_missing=MAX_MISSING_RATIO)
+    df_clean, na_counts = basic_clean(df_raw)
 
     print("\n=== After basic_clean ===")
     print(f"Shape: {df_clean.shape}")
     print("\nMissing values (top 10):")
-    print(df_clean.isna().sum().sort_values(ascending=False).head(10))
+    print(na_counts.sort_values(ascending=False).head(10))
 
     out_path = save_clean_base(df_clean)
     print(f"\nSaved clean base to: {out_path}")
@@ -1,22 +1,111 @@
+from __future__ import annotations
+
 import pandas as pd
 from pathlib import Path
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow es opcional: sin él no hay caché Parquet
+    pa = None
+    pq = None
+
 # Ruta base del proyecto (Project_AirQuality)
 BASE_DIR = Path(__file__).resolve().parents[1]
 
 # Carpeta donde está el CSV
 DATA_DIR = BASE_DIR / "data"
 
-def load_data(filename: str = "dataset_original.csv") -> pd.DataFrame:
+# Copias Parquet de los CSV (se regeneran si el CSV es más reciente)
+CACHE_DIR = DATA_DIR / "cache"
+
+# Subir este número cuando cambie cómo se parsea el CSV (invalida la caché)
+CACHE_VERSION = 1
+
+# Formato de la columna Date en el dataset (ISO, ej. 2015-01-01)
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def _missing_ratios(cache_path: Path) -> pd.Series | None:
+    """
+    Per-column missing ratio from the Parquet footer statistics (no data read).
+    Returns None if some column has no null-count statistics.
+    """
+    meta = pq.ParquetFile(cache_path).metadata
+    if meta.num_rows == 0:
+        return None
+
+    nulls: dict[str, int] = {}
+    for i in range(meta.num_row_groups):
+        row_group = meta.row_group(i)
+        for j in range(row_group.num_columns):
+            chunk = row_group.column(j)
+            stats = chunk.statistics
+            if stats is None or not stats.has_null_count:
+                return None
+            name = chunk.path_in_schema
+            nulls[name] = nulls.get(name, 0) + stats.null_count
+
+    return pd.Series(nulls) / meta.num_rows
+
+
+def load_data(
+    filename: str = "dataset_original.csv", max_missing: float | None = None
+) -> pd.DataFrame:
     """
     Load raw air quality dataset from data/ directory.
+    With pyarrow installed, the first load writes a Parquet mirror to data/cache/;
+    later loads read it while it is newer than the CSV.
+    If max_missing is given, cached loads skip columns whose missing ratio is
+    above it (decided from Parquet metadata, so those columns are never read).
     """
     file_path = DATA_DIR / filename
 
     if not file_path.exists():
         raise FileNotFoundError(f"Dataset not found at {file_path}")
 
-    df = pd.read_csv(file_path)
+    cache_path = CACHE_DIR / f"{filename}.v{CACHE_VERSION}.parquet"
+    if (
+        pq is not None
+        and cache_path.exists()
+        and cache_path.stat().st_mtime >= file_path.stat().st_mtime
+    ):
+        columns = None
+        ratios = _missing_ratios(cache_path) if max_missing is not None else None
+        if ratios is not None:
+            skipped = ratios[ratios > max_missing].index.tolist()
+            columns = ratios[ratios <= max_missing].index.tolist()
+            if skipped:
+                print(f"Skipping columns (>{max_missing:.0%} missing): {skipped}")
+
+        df = pd.read_parquet(
+            cache_path, columns=columns, engine="pyarrow", dtype_backend="pyarrow"
+        )
+        # Mismo dtype de Date que en la carga desde CSV (datetime64, no timestamp Arrow)
+        if "Date" in df.columns and isinstance(df["Date"].dtype, pd.ArrowDtype):
+            unit = df["Date"].dtype.pyarrow_dtype.unit
+            df["Date"] = df["Date"].astype(f"datetime64[{unit}]")
+        return df
+
+    # Parsear Date dentro del lector C con formato explícito (sin inferencia por fila)
+    # y, con pyarrow, dejar las columnas en buffers Arrow (texto sin objetos Python)
+    backend = {"dtype_backend": "pyarrow"} if pq is not None else {}
+    df = pd.read_csv(
+        file_path,
+        parse_dates=["Date"],
+        date_format=DATE_FORMAT,
+        cache_dates=True,
+        **backend,
+    )
+
+    if pq is not None:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(cache_path, engine="pyarrow", compression="zstd", index=False)
+        except (OSError, pa.ArrowException):
+            # carpeta de solo lectura o columna con tipos mezclados que Arrow
+            # no puede guardar: seguir sin caché
+            pass
     return df
 
 
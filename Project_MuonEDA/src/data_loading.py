@@ -1,11 +1,26 @@
 # src/data_loading.py
 from __future__ import annotations
 
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass
 import pandas as pd
 import numpy as np
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional; fall back to the pandas C parser
+    pa = None
+    pacsv = None
+
+try:
+    import polars as pl
+except ImportError:  # polars is optional; schema stats fall back to pandas
+    pl = None
+
 
 # ----------------------------
 # Config
@@ -45,34 +60,149 @@ def get_paths() -> Paths:
 # ----------------------------
 # Loading (robust)
 # ----------------------------
-def load_munra_raw(raw_path: Path) -> pd.DataFrame:
+ARROW_BLOCK_SIZE = 8 << 20  # 8 MiB per parse block
+CHUNK_ROWS = 500_000  # lines per block in the C-parser path
+CACHE_VERSION = 2  # bump when parsing changes, so old Parquet caches are ignored
+
+
+def _concat_blocks(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def _is_single_tab_separated(raw_path: Path) -> bool:
     """
-    Load the raw whitespace-separated file.
-    We expect 10 fields per valid line. Bad lines are skipped.
+    True if fields are already separated by exactly one tab (no spaces, no tab
+    runs, no CR, no tabs at line edges). Checked with byte searches over a
+    memory map, without decoding or splitting lines.
     """
-    if not raw_path.exists():
-        raise FileNotFoundError(f"RAW file not found: {raw_path}")
+    if raw_path.stat().st_size == 0:
+        return False
+    with open(raw_path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[:1] == b"\t" or mm[-1:] == b"\t":
+            return False
+        return all(mm.find(pat) == -1 for pat in (b" ", b"\r", b"\t\t", b"\n\t", b"\t\n"))
+
+
+def _skip_long_rows(row) -> str:
+    return "skip" if row.actual_columns > row.expected_columns else "error"
+
+
+def _read_whitespace_arrow(raw_path: Path) -> pd.DataFrame:
+    """
+    Parse a single-tab-separated file with Arrow's streaming CSV reader,
+    straight from a memory map, one block at a time.
+    As with on_bad_lines="skip", rows with too many fields are skipped. Short
+    rows, which read_csv pads with NaN, raise ArrowInvalid so the caller can
+    fall back to the C parser. All-empty rows are dropped per block before the
+    blocks are concatenated.
+    """
+    frames: list[pd.DataFrame] = []
+    with pa.memory_map(str(raw_path), "r") as stream:
+        reader = pacsv.open_csv(
+            stream,
+            read_options=pacsv.ReadOptions(
+                autogenerate_column_names=True,
+                block_size=ARROW_BLOCK_SIZE,
+            ),
+            parse_options=pacsv.ParseOptions(
+                delimiter="\t",
+                invalid_row_handler=_skip_long_rows,
+            ),
+        )
+        for batch in reader:
+            frames.append(batch.to_pandas().dropna(how="all"))
+    return _concat_blocks(frames)
+
 
-    df = pd.read_csv(
+def _read_whitespace_c(raw_path: Path) -> pd.DataFrame:
+    """
+    pandas' C parser (sep=r"\s+"), CHUNK_ROWS lines at a time.
+    Used for files that are not single-tab-separated, without pyarrow, or when
+    the Arrow reader gives up. Lines with too many fields are skipped and short
+    lines are padded with NaN (on_bad_lines="skip").
+    """
+    frames: list[pd.DataFrame] = []
+    with pd.read_csv(
         raw_path,
         sep=r"\s+",
         header=None,
-        engine="python",
+        engine="c",
         on_bad_lines="skip",
-    )
+        chunksize=CHUNK_ROWS,
+    ) as reader:
+        for chunk in reader:
+            frames.append(chunk.dropna(how="all"))
+    return _concat_blocks(frames)
 
-    # Drop totally empty rows if any sneaked in
-    df = df.dropna(how="all")
 
-    # Safety: ensure exactly 10 columns (if not, fail fast)
-    if df.shape[1] != 10:
+def _peek_field_count(raw_path: Path) -> int:
+    """
+    Number of whitespace-separated fields in the first non-blank line
+    (0 if the file has no data lines). Reads only up to that line.
+    """
+    with open(raw_path, "rb") as fh:
+        for line in fh:
+            tokens = line.split()
+            if tokens:
+                return len(tokens)
+    return 0
+
+
+def load_munra_raw(raw_path: Path) -> pd.DataFrame:
+    """
+    Load the raw whitespace-separated file.
+    We expect 10 fields per valid line. Lines with more fields are skipped;
+    shorter lines are kept and padded with NaN, as read_csv does.
+    Single-tab-separated files are read with pyarrow when available; anything
+    else (or any Arrow failure) goes through pandas' C parser.
+    With pyarrow, the parsed frame is cached as <raw>.v<CACHE_VERSION>.parquet
+    next to the raw file and reused while it is newer than the raw file.
+    If the cache cannot be written (read-only data dir, mixed-type column),
+    loading still works.
+    """
+    if not raw_path.exists():
+        raise FileNotFoundError(f"RAW file not found: {raw_path}")
+
+    cache_path = raw_path.with_suffix(f".v{CACHE_VERSION}.parquet")
+    if (
+        pa is not None
+        and cache_path.exists()
+        and cache_path.stat().st_mtime >= raw_path.stat().st_mtime
+    ):
+        return pd.read_parquet(cache_path, engine="pyarrow")
+
+    # Safety: ensure exactly 10 columns before the full parse (fail fast).
+    # Both parsers take the field count from the first line, so no check is
+    # needed after parsing.
+    n_fields = _peek_field_count(raw_path)
+    if n_fields != 10:
         raise ValueError(
-            f"Expected 10 columns after parsing, got {df.shape[1]}. "
+            f"Expected 10 columns, got {n_fields} in the first data line. "
             f"Check delimiter or file format."
         )
 
+    df = None
+    if pa is not None and _is_single_tab_separated(raw_path):
+        try:
+            df = _read_whitespace_arrow(raw_path)
+        except pa.ArrowInvalid:
+            df = None
+
+    if df is None:
+        df = _read_whitespace_c(raw_path)
+
     # Use neutral column names first (no physics assumptions)
     df.columns = [f"col_{i}" for i in range(10)]
+
+    if pa is not None:
+        try:
+            df.to_parquet(cache_path, engine="pyarrow", compression="zstd", index=False)
+        except (OSError, pa.ArrowException):
+            # Read-only data dir, or a mixed-type column Arrow cannot store:
+            # keep going without a cache
+            pass
     return df
 
 
@@ -85,15 +215,14 @@ def basic_structural_clean(df: pd.DataFrame) -> pd.DataFrame:
     - Ensure consistent dtypes (best-effort).
     - Strip whitespace in string columns.
     """
-    out = df.copy()
-
     # Try to convert everything except last col to numeric
     # (In your dataset, col_9 is "COSMIC". We keep it robust anyway.)
-    for c in out.columns:
-        if c == "col_9":
-            out[c] = out[c].astype(str).str.strip()
-        else:
-            out[c] = pd.to_numeric(out[c], errors="coerce")
+    # One batched conversion for the numeric block instead of a Python loop.
+    num_cols = [c for c in df.columns if c != "col_9"]
+    out = df[num_cols].apply(pd.to_numeric, errors="coerce")
+    if "col_9" in df.columns:
+        text_dtype = "string[pyarrow]" if pa is not None else "string"
+        out["col_9"] = df["col_9"].astype(text_dtype).str.strip()
 
     # If any NaN appear due to parsing issues, keep rows but note in report
     return out
@@ -102,14 +231,34 @@ def basic_structural_clean(df: pd.DataFrame) -> pd.DataFrame:
 # ----------------------------
 # Schema / functional profiling (no physics)
 # ----------------------------
-def _monotonic_hint(s: pd.Series) -> str:
-    s = s.dropna()
-    if s.empty:
+@dataclass(frozen=True)
+class ConstantHint:
+    kind: str  # "empty" | "constant" | "near_constant" | "low_cardinality" | "varies"
+    nunique: int = 0
+    value_range: float | None = None
+    first: object = None
+
+
+@dataclass(frozen=True)
+class ColumnProfile:
+    column: str
+    dtype: str
+    is_numeric: bool
+    empty: bool
+    nunique: int
+    mn: float | None
+    mx: float | None
+    zero_frac: float | None
+    monotonic: str
+    constant: ConstantHint
+    role: str
+
+
+def _monotonic_hint(is_num: bool, empty: bool, inc: bool, dec: bool) -> str:
+    if empty:
         return "empty"
-    if not pd.api.types.is_numeric_dtype(s):
+    if not is_num:
         return "n/a"
-    inc = s.is_monotonic_increasing
-    dec = s.is_monotonic_decreasing
     if inc and not dec:
         return "monotonic_increasing"
     if dec and not inc:
@@ -117,34 +266,158 @@ def _monotonic_hint(s: pd.Series) -> str:
     return "not_monotonic"
 
 
-def _zero_fraction(s: pd.Series) -> str:
-    s = s.dropna()
-    if s.empty or not pd.api.types.is_numeric_dtype(s):
-        return "n/a"
-    return f"{(s.eq(0).mean()*100):.2f}%"
+def _zero_fraction(is_num: bool, zeros: int, count: int) -> float | None:
+    if count == 0 or not is_num:
+        return None
+    return zeros / count
 
 
-def _constant_hint(s: pd.Series) -> str:
-    s2 = s.dropna()
-    if s2.empty:
-        return "empty"
+def _constant_hint(
+    empty: bool, is_num: bool, nun: int, mn: float | None, mx: float | None, first
+) -> ConstantHint:
+    if empty:
+        return ConstantHint("empty")
 
-    nun = s2.nunique()
     if nun == 1:
-        return f"constant({s2.iloc[0]})"
+        return ConstantHint("constant", nun, first=first)
 
     # If numeric with very small range and few unique values -> near-constant
-    if pd.api.types.is_numeric_dtype(s2) and nun <= 5:
-        mn = float(s2.min())
-        mx = float(s2.max())
+    if is_num and nun <= 5:
         rng = mx - mn
         if rng <= 0.5:  # functional threshold: "small variation"
-            return f"near_constant(nunique={nun}, range={rng:.4g})"
+            return ConstantHint("near_constant", nun, value_range=rng)
 
     if nun <= 3:
-        return f"low_cardinality(nunique={nun})"
+        return ConstantHint("low_cardinality", nun)
+
+    return ConstantHint("varies", nun)
+
+
+def _format_constant_hint(hint: ConstantHint) -> str:
+    if hint.kind == "constant":
+        return f"constant({hint.first})"
+    if hint.kind == "near_constant":
+        return f"near_constant(nunique={hint.nunique}, range={hint.value_range:.4g})"
+    if hint.kind == "low_cardinality":
+        return f"low_cardinality(nunique={hint.nunique})"
+    return hint.kind
+
+
+def _format_summary_row(p: ColumnProfile) -> dict:
+    """
+    The only place where profile values are turned into report text.
+    """
+    show_num = p.is_numeric and not p.empty
+    return {
+        "column": p.column,
+        "dtype": p.dtype,
+        "nunique": p.nunique,
+        "min": f"{p.mn:.4g}" if show_num else "",
+        "max": f"{p.mx:.4g}" if show_num else "",
+        "% zeros": f"{(p.zero_frac*100):.2f}%" if p.zero_frac is not None else "n/a",
+        "monotonic": p.monotonic if p.is_numeric else "n/a",
+        "const/low-card": _format_constant_hint(p.constant),
+        "possible role (hypothesis)": p.role,
+    }
+
+
+STAT_COLUMNS = ["count", "nunique", "min", "max", "zeros"]
+
+
+def _numeric_stats_polars(num_df: pd.DataFrame) -> pd.DataFrame | None:
+    """
+    STAT_COLUMNS for numeric columns in one fused, multithreaded polars query.
+    Returns None when polars cannot take the frame, so callers use pandas.
+    """
+    cols = list(num_df.columns)
+    if not cols or not all(isinstance(c, str) for c in cols):
+        return None
+
+    exprs = []
+    for i, c in enumerate(cols):
+        col = pl.col(c)
+        exprs += [
+            col.count().cast(pl.Int64).alias(f"{i}_count"),
+            col.drop_nulls().n_unique().cast(pl.Int64).alias(f"{i}_nunique"),
+            col.min().cast(pl.Float64).alias(f"{i}_min"),
+            col.max().cast(pl.Float64).alias(f"{i}_max"),
+            (col.cast(pl.Float64) == 0).sum().cast(pl.Int64).alias(f"{i}_zeros"),
+        ]
+    try:
+        row = pl.from_pandas(num_df).lazy().select(exprs).collect().row(0)
+    except (ValueError, TypeError, pl.exceptions.PolarsError):
+        return None
+
+    n = len(STAT_COLUMNS)
+    stats = pd.DataFrame(
+        [row[i * n:(i + 1) * n] for i in range(len(cols))],
+        index=cols,
+        columns=STAT_COLUMNS,
+    )
+    return stats.astype({"min": "float64", "max": "float64"})
+
+
+def _frame_stats(df: pd.DataFrame, numeric_cols: set[str]) -> pd.DataFrame:
+    """
+    Per-column count (non-null), nunique, min, max and zero count, indexed by column.
+    Numeric columns go through a single polars query when polars is installed,
+    otherwise one batched pandas reduction per statistic.
+    min/max are NaN and zeros is 0 for non-numeric columns.
+    """
+    cols = list(df.columns)
+    num_df = df[[c for c in cols if c in numeric_cols]]
+    stats = _numeric_stats_polars(num_df) if pl is not None else None
+    if stats is not None:
+        other = df[[c for c in cols if c not in numeric_cols]]
+        rest = pd.DataFrame(
+            {"count": other.count(), "nunique": other.nunique(dropna=True)},
+            index=other.columns,
+        ).assign(min=np.nan, max=np.nan, zeros=0)
+        return pd.concat([stats, rest]).reindex(cols)
+
+    if num_df.columns.empty:  # agg() raises on a frame with no columns
+        min_max = pd.DataFrame(columns=["min", "max"], dtype="float64")
+    else:
+        min_max = num_df.agg(["min", "max"]).T
+    return pd.DataFrame(
+        {
+            "count": df.count(),
+            "nunique": df.nunique(dropna=True),
+            "min": min_max["min"].reindex(cols),
+            "max": min_max["max"].reindex(cols),
+            "zeros": num_df.eq(0).sum().reindex(cols, fill_value=0),
+        },
+        index=cols,
+    )
 
-    return "varies"
+
+# Column summary table: header -> Markdown alignment marker
+SUMMARY_ALIGN = {
+    "column": "---",
+    "dtype": "---:",
+    "nunique": "---:",
+    "min": "---:",
+    "max": "---:",
+    "% zeros": "---:",
+    "monotonic": "---:",
+    "const/low-card": "---:",
+    "possible role (hypothesis)": "---",
+}
+
+
+def _markdown_table(summary: pd.DataFrame, align: dict[str, str]) -> str:
+    """
+    Render a DataFrame as a Markdown table (header, alignment row, body).
+    Cells are joined column-wise with vectorized string ops, not per row.
+    """
+    header = "| " + " | ".join(align) + " |"
+    marks = "|" + "|".join(align.values()) + "|"
+    cells = summary.astype(str)
+    body = "| " + cells.iloc[:, 0]
+    for c in cells.columns[1:]:
+        body = body + " | " + cells[c]
+    body = body + " |"
+    return "\n".join([header, marks, *body.tolist()])
 
 
 def build_schema_report(df: pd.DataFrame) -> str:
@@ -169,47 +442,85 @@ def build_schema_report(df: pd.DataFrame) -> str:
     lines.append("")
 
     # Candidate role hints based purely on patterns
-    def possible_role(col: str, s: pd.Series) -> str:
+    def possible_role(
+        col: str,
+        is_num: bool,
+        nun: int,
+        mn: float | None,
+        mx: float | None,
+        zero_frac_all: float | None,
+        mono: str,
+    ) -> str:
         # Only pattern-based hints
-        if col == "col_9" and s.nunique() == 1:
+        if col == "col_9" and nun == 1:
             return "label/type (constant category)"
-        if pd.api.types.is_numeric_dtype(s):
-            if s.nunique() == 1:
+        if is_num:
+            if nun == 1:
                 return "constant sensor/setting (e.g., fixed parameter)"
-                        # Near-constant numeric (few unique, tiny range)
-            s_num = s.dropna()
-            if s_num.nunique() <= 5 and (float(s_num.max()) - float(s_num.min())) <= 0.5:
+            # Near-constant numeric (few unique, tiny range)
+            if nun <= 5 and mn is not None and (mx - mn) <= 0.5:
                 return "near-constant reading (low variation)"
-            if _zero_fraction(s) != "n/a" and s.eq(0).mean() > 0.95:
+            if zero_frac_all is not None and zero_frac_all > 0.95:
                 return "flag/status/unused channel (mostly zeros)"
-            if _monotonic_hint(s) == "monotonic_increasing":
+            if mono == "monotonic_increasing":
                 return "counter or time-like variable (monotonic)"
         return "unknown"
 
     lines.append("## Column summary")
     lines.append("")
-    lines.append("| column | dtype | nunique | min | max | % zeros | monotonic | const/low-card | possible role (hypothesis) |")
-    lines.append("|---|---:|---:|---:|---:|---:|---:|---:|---|")
-
-    for col in df.columns:
-        s = df[col]
-        dtype = str(s.dtype)
-        nun = int(s.dropna().nunique())
 
-        if pd.api.types.is_numeric_dtype(s):
-            s_num = s.dropna()
-            mn = f"{s_num.min():.4g}" if not s_num.empty else ""
-            mx = f"{s_num.max():.4g}" if not s_num.empty else ""
-            zf = _zero_fraction(s)
-            mono = _monotonic_hint(s)
-        else:
-            mn, mx, zf, mono = "", "", "n/a", "n/a"
-
-        const_hint = _constant_hint(s)
-        role = possible_role(col, s)
+    # Frame-wide reductions computed up front instead of per-column calls.
+    # Only monotonicity and the first value still need the column itself.
+    numeric_cols = {c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])}
+    stats = _frame_stats(df, numeric_cols)
+    counts, nuniques, zeros = stats["count"], stats["nunique"], stats["zeros"]
+    min_max = stats[["min", "max"]]
+
+    # Columns are profiled independently, so they run on a thread pool
+    # (the NumPy/pandas reductions inside release the GIL).
+    def profile_column(col: str) -> ColumnProfile:
+        s_all = df[col]
+        s = s_all.dropna()
+        is_num = col in numeric_cols
+        count = int(counts[col])
+        empty = count == 0
+        nun = int(nuniques[col])
+
+        mn = mx = zero_frac_all = None
+        inc = dec = False
+        if is_num and not empty:
+            mn, mx = float(min_max.at[col, "min"]), float(min_max.at[col, "max"])
+            zero_frac_all = int(zeros[col]) / len(s_all)
+            # Compare neighbours in the column's own dtype: a float64 cast loses
+            # precision above 2**53, and an int np.diff can overflow.
+            arr = s.to_numpy()
+            inc = bool((arr[1:] >= arr[:-1]).all())
+            dec = bool((arr[1:] <= arr[:-1]).all())
+
+        mono = _monotonic_hint(is_num, empty, inc, dec)
+        first = s.iat[0] if not empty else None
+
+        return ColumnProfile(
+            column=col,
+            dtype=str(s_all.dtype),
+            is_numeric=is_num,
+            empty=empty,
+            nunique=nun,
+            mn=mn,
+            mx=mx,
+            zero_frac=_zero_fraction(is_num, int(zeros[col]), count),
+            monotonic=mono,
+            constant=_constant_hint(empty, is_num, nun, mn, mx, first),
+            role=possible_role(col, is_num, nun, mn, mx, zero_frac_all, mono),
+        )
 
-        lines.append(f"| {col} | {dtype} | {nun} | {mn} | {mx} | {zf} | {mono} | {const_hint} | {role} |")
+    workers = max(1, min(len(df.columns), os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        profiles = list(ex.map(profile_column, df.columns))
 
+    rows = [_format_summary_row(p) for p in profiles]
+    summary = pd.DataFrame(rows, columns=list(SUMMARY_ALIGN))
+    lines.append(_markdown_table(summary, SUMMARY_ALIGN))
     lines.append("")
     lines.append("## Notes / next steps")
     lines.append("")
@@ -231,11 +542,13 @@ def ensure_dirs(paths: Paths) -> None:
 
 
 def save_clean_csv(df: pd.DataFrame, out_path: Path) -> None:
+    # Plain pandas writer on purpose: munra_clean.csv is fingerprinted in
+    # reports/data_freeze.md, so its exact bytes must not change.
     df.to_csv(out_path, index=False)
 
 
 def save_report(text: str, out_path: Path) -> None:
-    out_path.write_text(text, encoding="utf-8")
+    out_path.write_bytes(text.encode("utf-8"))
 
 
 # ----------------------------